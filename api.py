@@ -1,11 +1,39 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from engine import Economy
-from typing import List, Dict, Any, Union
+from engine import Economy, load_param_file
+from throttle import TokenBucketLimiter, SingleFlight
+import history
+from typing import List, Dict, Any, Union, Optional
+import os
+import uuid
+import threading
 
 app = FastAPI(title="Taraz API", version="0.1.0")
 
+# --- Rate limiting ---
+# One token bucket per (client, endpoint), so a slider burst on /forecast can't lock out /next_turn.
+RATE_LIMITED_PATHS = {"/forecast", "/next_turn", "/branches"}
+limiter = TokenBucketLimiter(
+    rate=float(os.environ.get("TARAZ_RATE_LIMIT", "10")),
+    burst=float(os.environ.get("TARAZ_RATE_BURST", "20")),
+)
+
+# Registered before CORS so that 429s still carry CORS headers. Rejects before the body is read.
+@app.middleware("http")
+async def rate_limit(request: Request, call_next):
+    if request.url.path in RATE_LIMITED_PATHS:
+        client = request.client.host if request.client else "unknown"
+        allowed, retry_after = limiter.allow((client, request.url.path))
+        if not allowed:
+            return JSONResponse(
+                status_code=429,
+                content={"detail": "Too many requests"},
+                headers={"Retry-After": str(max(1, round(retry_after)))},
+            )
+    return await call_next(request)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -14,12 +42,63 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-game_instance = Economy()
+# Branches of the current game. "main" is the one the frontend plays; the rest are forks.
+# Nothing is built at import time: "main" is created on first use, so a cold worker
+# only pays for FastAPI + the engine module before it can answer.
+games: Dict[str, Economy] = {}
+MAX_BRANCHES = int(os.environ.get("TARAZ_MAX_BRANCHES", "32")) # forks, not counting "main"
+_games_lock = threading.Lock() # sync endpoints run in a threadpool; each Economy also locks its own state
+
+# Optional calibrated parameter file (see calibrate.py), parsed once per process on first use.
+PARAMS_FILE = os.environ.get("TARAZ_PARAMS")
+_params_cache: Dict[str, Dict[str, float]] = {}
+
+forecast_flight = SingleFlight()
+
+# Finished (or abandoned) games are appended here for offline aggregation (see history.py).
+# One record per game: only "main" is written, and only once, whatever forks or rewinds happen.
+HISTORY_FILE = os.environ.get("TARAZ_HISTORY_FILE")
+session = {"game_id": uuid.uuid4().hex, "persisted": False}
+
+def persist_main(game: Economy, outcome: Optional[str] = None):
+    with _games_lock:
+        if session["persisted"] or games.get("main") is not game:
+            return
+        session["persisted"] = True
+        game_id = session["game_id"]
+    if HISTORY_FILE and game.has_history():
+        history.append_game(HISTORY_FILE, history.game_record(game, game_id, outcome))
+
+def new_game() -> Economy:
+    if PARAMS_FILE and PARAMS_FILE not in _params_cache:
+        _params_cache[PARAMS_FILE] = load_param_file(PARAMS_FILE)
+    return Economy(params=_params_cache.get(PARAMS_FILE))
+
+def get_game(branch: str) -> Economy:
+    if branch == "main" and branch not in games:
+        with _games_lock:
+            if "main" not in games: # another request may have built it while we waited
+                games["main"] = new_game()
+    if branch not in games:
+        raise HTTPException(status_code=404, detail=f"Unknown branch '{branch}'")
+    return games[branch]
 
 class PolicyInput(BaseModel):
     interest_rate: float
     money_printer: float = 0.0
     lang: str = "en" # Input language for POST
+    branch: str = "main"
+
+class ForkInput(BaseModel):
+    source: str = "main"
+    turn: Optional[int] = None # None = fork from the current turn
+    name: Optional[str] = None
+
+class BranchInfo(BaseModel):
+    branch: str
+    turn: int
+    gov_type: str
+    is_game_over: bool
 
 class EventModel(BaseModel):
     title: str
@@ -76,7 +155,8 @@ def read_root():
     return {"status": "online", "game": "Taraz Simulator"}
 
 @app.get("/state", response_model=GameState)
-def get_state(lang: str = Query("en", regex="^(en|fa)$")):
+def get_state(lang: str = Query("en", regex="^(en|fa)$"), branch: str = "main"):
+    game_instance = get_game(branch)
     # Get Raw State (with dicts)
     raw_state = game_instance.next_turn(game_instance.policy_history[-1], 0, is_simulation=True)
     
@@ -103,7 +183,11 @@ def next_turn(policy: PolicyInput):
     if not (-50.0 <= policy.money_printer <= 50.0):
         raise HTTPException(status_code=400, detail="Money printer invalid")
 
+    game_instance = get_game(policy.branch)
+    was_over = game_instance.game_over_status["is_game_over"]
     raw_state = game_instance.next_turn(policy.interest_rate, policy.money_printer)
+    if raw_state["is_game_over"] and not was_over and policy.branch == "main":
+        persist_main(game_instance)
     
     # Localize
     localized_state = localize(raw_state, policy.lang)
@@ -111,11 +195,85 @@ def next_turn(policy: PolicyInput):
 
 @app.post("/forecast", response_model=List[ForecastPoint])
 def get_forecast(policy: PolicyInput):
-    forecast = game_instance.simulate_future(policy.interest_rate, policy.money_printer)
+    game = get_game(policy.branch)
+    # Identical in-flight forecasts (same state, same levers) share one computation
+    key = (game.forecast_key(), policy.interest_rate, policy.money_printer)
+    forecast = forecast_flight.do(key, lambda: game.simulate_future(policy.interest_rate, policy.money_printer))
     return forecast
 
 @app.post("/reset")
 def reset_game():
-    global game_instance
-    game_instance = Economy()
-    return {"message": "Game reset successfully", "turn": 1}
\ No newline at end of file
+    main = games.get("main")
+    if main:
+        persist_main(main, outcome=None if main.game_over_status["is_game_over"] else "abandoned")
+    with _games_lock:
+        games.clear()
+        games["main"] = new_game()
+        session.update(game_id=uuid.uuid4().hex, persisted=False)
+    return {"message": "Game reset successfully", "turn": 1}
+
+@app.get("/history")
+def get_history(
+    branch: str = "main",
+    start: Optional[int] = Query(None, ge=1),
+    end: Optional[int] = Query(None, ge=1),
+    every: int = Query(1, ge=1),
+    max_points: Optional[int] = Query(None, ge=2),
+):
+    """Logged turns of a branch as columns, optionally limited to [start, end] and downsampled."""
+    columns = get_game(branch).history_columns(start, end)
+    return {"branch": branch, "columns": history.downsample(columns, every, max_points)}
+
+# --- Time travel & Branching ---
+
+@app.get("/branches", response_model=List[BranchInfo])
+def list_branches():
+    get_game("main")
+    return [
+        {"branch": name, "turn": g.turn, "gov_type": g.gov.type_key, "is_game_over": g.game_over_status["is_game_over"]}
+        for name, g in games.items()
+    ]
+
+@app.post("/branches", response_model=BranchInfo)
+def fork_branch(fork: ForkInput):
+    source = get_game(fork.source)
+    name = fork.name or uuid.uuid4().hex[:8]
+    try:
+        branch = source.fork(fork.turn)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    with _games_lock:
+        if name in games:
+            raise HTTPException(status_code=409, detail=f"Branch '{name}' already exists")
+        if len(games) - 1 >= MAX_BRANCHES:
+            raise HTTPException(status_code=409, detail=f"Branch limit reached ({MAX_BRANCHES}); delete one first")
+        games[name] = branch
+    return {"branch": name, "turn": branch.turn, "gov_type": branch.gov.type_key, "is_game_over": branch.game_over_status["is_game_over"]}
+
+@app.post("/branches/{branch}/rewind", response_model=BranchInfo)
+def rewind_branch(branch: str, turn: int):
+    game = get_game(branch)
+    try:
+        game.restore(game.snapshot_at(turn))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"branch": branch, "turn": game.turn, "gov_type": game.gov.type_key, "is_game_over": game.game_over_status["is_game_over"]}
+
+@app.delete("/branches/{branch}")
+def delete_branch(branch: str):
+    if branch == "main":
+        raise HTTPException(status_code=400, detail="The main branch can't be deleted")
+    get_game(branch)
+    with _games_lock:
+        games.pop(branch, None) # a concurrent delete may have got here first
+    return {"message": f"Branch '{branch}' deleted"}
+
+@app.get("/branches/compare")
+def compare_branches(ids: List[str] = Query(...)):
+    """Side-by-side history of several branches, aligned by turn."""
+    histories = {name: {row["turn"]: row for row in get_game(name).history} for name in ids}
+    turns = sorted(set().union(*histories.values()))
+    return [
+        {"turn": turn, "branches": {name: rows.get(turn) for name, rows in histories.items()}}
+        for turn in turns
+    ]
\ No newline at end of file
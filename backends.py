@@ -0,0 +1,145 @@
+import importlib
+import importlib.util
+
+# numpy is optional and costs more to import than the rest of the engine together,
+# so it is only loaded once a vectorized backend is actually asked for.
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+def _numpy():
+    if not HAS_NUMPY:
+        raise ImportError("The 'numpy' backend requires numpy (pip install numpy)")
+    return importlib.import_module("numpy")
+
+
+# Every tunable the step kernel reads. Defaults live on Economy as class constants.
+PARAM_NAMES = (
+    "TARGET_INFLATION", "TARGET_GDP_GROWTH", "TARGET_UNEMPLOYMENT",
+    "SENSITIVITY_INFLATION", "SENSITIVITY_GDP", "SENSITIVITY_UNEMPLOYMENT",
+    "GLOBAL_INTEREST_RATE", "SENSITIVITY_FX", "PASS_THROUGH_COEF",
+    "DEPRECIATION_ANCHOR", "SENSITIVITY_DEPRECIATION", "SENSITIVITY_EXPORT_GDP",
+    "SENSITIVITY_MONEY_INFLATION", "SENSITIVITY_MONEY_GDP", "SENSITIVITY_MONEY_FX",
+    "GRAVITY_GDP", "GRAVITY_INFLATION", "GRAVITY_UNEMPLOYMENT",
+    "MIN_INFLATION", "MAX_INFLATION",
+    "MIN_UNEMPLOYMENT", "MAX_UNEMPLOYMENT",
+    "MIN_GDP", "MAX_GDP",
+    "MIN_EXCHANGE_RATE",
+)
+
+# Fields of the macro state a backend reads and writes.
+STATE_FIELDS = (
+    "inflation", "gdp_growth", "unemployment",
+    "exchange_rate", "fx_change_rate", "money_supply_index",
+)
+
+
+class ReferenceBackend:
+    """Pure Python kernel, one game at a time. This is the ground truth.
+
+    Contract shared by all backends:
+      step(state, params, profile, effective_rate, money_printer)
+          advances `state` (any object with STATE_FIELDS attributes) by one month, in place.
+      clamp(state, params)
+          applies the model bounds, in place.
+    `profile` is a government profile dict (only budget_bias / inflation_bias are read).
+    """
+    name = "reference"
+
+    def _floor(self, value, low):
+        return max(low, value)
+
+    def _clip(self, value, low, high):
+        return max(low, min(high, value))
+
+    def step(self, state, params, profile, effective_rate, money_printer):
+        p = params
+        state.money_supply_index += money_printer
+
+        # FX Logic
+        rate_differential = effective_rate - p["GLOBAL_INTEREST_RATE"]
+        natural_depreciation = (state.inflation - p["DEPRECIATION_ANCHOR"]) * p["SENSITIVITY_DEPRECIATION"]
+        capital_flow_effect = rate_differential * p["SENSITIVITY_FX"]
+        money_supply_shock = money_printer * p["SENSITIVITY_MONEY_FX"]
+        state.fx_change_rate = natural_depreciation - capital_flow_effect + money_supply_shock
+        state.exchange_rate = state.exchange_rate * (1 + (state.fx_change_rate / 100.0))
+        state.exchange_rate = self._floor(state.exchange_rate, p["MIN_EXCHANGE_RATE"])
+
+        # Core Physics
+        real_rate_gap = effective_rate - state.inflation
+        gov_inflation = profile["inflation_bias"]
+        inflation_delta = -(real_rate_gap * p["SENSITIVITY_INFLATION"])
+        import_inflation = state.fx_change_rate * p["PASS_THROUGH_COEF"]
+        monetary_inflation = money_printer * p["SENSITIVITY_MONEY_INFLATION"]
+        inflation_gravity = (p["TARGET_INFLATION"] - state.inflation) * p["GRAVITY_INFLATION"]
+
+        state.inflation += (inflation_delta + import_inflation + monetary_inflation + inflation_gravity + gov_inflation)
+
+        gov_spending = profile["budget_bias"]
+        gdp_pressure = -(real_rate_gap * p["SENSITIVITY_GDP"])
+        export_boost = state.fx_change_rate * p["SENSITIVITY_EXPORT_GDP"]
+        monetary_stimulus = money_printer * p["SENSITIVITY_MONEY_GDP"]
+        gdp_gravity = (p["TARGET_GDP_GROWTH"] - state.gdp_growth) * p["GRAVITY_GDP"]
+
+        state.gdp_growth += (gdp_pressure + export_boost + monetary_stimulus + gdp_gravity + gov_spending)
+
+        gdp_gap = p["TARGET_GDP_GROWTH"] - state.gdp_growth
+        unemployment_delta = (gdp_gap * p["SENSITIVITY_UNEMPLOYMENT"])
+        unemployment_gravity = (p["TARGET_UNEMPLOYMENT"] - state.unemployment) * p["GRAVITY_UNEMPLOYMENT"]
+        state.unemployment += (unemployment_delta + unemployment_gravity)
+
+    def clamp(self, state, params):
+        p = params
+        state.inflation = self._clip(state.inflation, p["MIN_INFLATION"], p["MAX_INFLATION"])
+        state.unemployment = self._clip(state.unemployment, p["MIN_UNEMPLOYMENT"], p["MAX_UNEMPLOYMENT"])
+        state.gdp_growth = self._clip(state.gdp_growth, p["MIN_GDP"], p["MAX_GDP"])
+
+
+class NumpyBackend(ReferenceBackend):
+    """Vectorized kernel: same contract, but every state field (and optionally
+    effective_rate, money_printer and the profile biases) may be an array,
+    so a whole batch of games advances in one call."""
+    name = "numpy"
+
+    def __init__(self):
+        self.np = _numpy()
+
+    def _floor(self, value, low):
+        return self.np.maximum(value, low)
+
+    def _clip(self, value, low, high):
+        return self.np.clip(value, low, high)
+
+
+class BatchState:
+    """Struct-of-arrays macro state for the vectorized backend."""
+
+    def __init__(self, **fields):
+        np = _numpy()
+        for name in STATE_FIELDS:
+            setattr(self, name, np.asarray(fields[name], dtype=np.float64).copy())
+
+    @classmethod
+    def from_economies(cls, economies):
+        return cls(**{name: [getattr(e, name) for e in economies] for name in STATE_FIELDS})
+
+    def __len__(self):
+        return len(self.inflation)
+
+
+BACKENDS = {
+    "reference": ReferenceBackend,
+    "numpy": NumpyBackend,
+}
+
+_instances = {}
+
+
+def get_backend(backend):
+    """Resolve a backend name (or pass through a backend instance)."""
+    if not isinstance(backend, str):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Available: {', '.join(BACKENDS)}")
+    if backend not in _instances:
+        _instances[backend] = BACKENDS[backend]()
+    return _instances[backend]
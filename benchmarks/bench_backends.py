@@ -0,0 +1,61 @@
+# benchmarks/bench_backends.py
+# Compare step-kernel throughput: N games x M months.
+#   python benchmarks/bench_backends.py --games 10000 --months 48
+import sys
+import os
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from engine import Economy, Government
+from backends import BatchState, get_backend, HAS_NUMPY
+
+
+def bench_reference(games, months, params):
+    backend = get_backend("reference")
+    start = time.perf_counter()
+    for game in games:
+        for _ in range(months):
+            backend.step(game, params, game.gov.profile, 15.0, 0.0)
+            backend.clamp(game, params)
+    return time.perf_counter() - start
+
+
+def bench_numpy(games, months, params):
+    import numpy as np
+    backend = get_backend("numpy")
+    batch = BatchState.from_economies(games)
+    profile = {
+        "inflation_bias": np.array([g.gov.profile["inflation_bias"] for g in games]),
+        "budget_bias": np.array([g.gov.profile["budget_bias"] for g in games]),
+    }
+    start = time.perf_counter()
+    for _ in range(months):
+        backend.step(batch, params, profile, 15.0, 0.0)
+        backend.clamp(batch, params)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Taraz model backends")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--months", type=int, default=Economy.MAX_TURNS)
+    args = parser.parse_args()
+
+    params = Economy.default_params()
+    gov_types = list(Government.TYPES)
+    make_games = lambda: [Economy(fixed_gov_type=gov_types[i % len(gov_types)]) for i in range(args.games)]
+
+    steps = args.games * args.months
+    print(f"{'Backend':<10} | {'Seconds':<8} | {'Steps/s':<12}")
+    print("-" * 36)
+    elapsed = bench_reference(make_games(), args.months, params)
+    print(f"{'reference':<10} | {elapsed:<8.3f} | {steps / elapsed:<12,.0f}")
+    if not HAS_NUMPY:
+        print(f"{'numpy':<10} | skipped (numpy not installed)")
+        return
+    elapsed = bench_numpy(make_games(), args.months, params)
+    print(f"{'numpy':<10} | {elapsed:<8.3f} | {steps / elapsed:<12,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/bench_startup.py
+# Cold-start budget: time from process spawn to first useful output.
+#   python benchmarks/bench_startup.py --runs 5
+# Exits non-zero when a median exceeds its budget, so it can gate CI.
+import sys
+import os
+import time
+import socket
+import argparse
+import statistics
+import subprocess
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds (median over runs)
+BUDGETS = {
+    "import engine": 0.15,
+    "import api": 1.5,
+    "uvicorn api:app -> GET /": 3.0,
+    "main.py -> first prompt": 0.5,
+}
+
+
+def time_import(module):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], cwd=ROOT, check=True)
+    return time.perf_counter() - start
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def time_uvicorn(timeout=30.0):
+    port = free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError("uvicorn did not answer in time")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def time_cli(prompt=b">> Set Policy"):
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "main.py"],
+        cwd=ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        env=dict(os.environ, TERM="dumb", PYTHONUNBUFFERED="1"),
+    )
+    try:
+        seen = b""
+        while prompt not in seen:
+            chunk = proc.stdout.read1(4096)
+            if not chunk:
+                raise RuntimeError("main.py exited before prompting")
+            seen += chunk
+        return time.perf_counter() - start
+    finally:
+        proc.communicate(b"q\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Taraz cold start")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--skip-api", action="store_true", help="Skip FastAPI/uvicorn measurements")
+    args = parser.parse_args()
+
+    cases = {
+        "import engine": lambda: time_import("engine"),
+        "main.py -> first prompt": time_cli,
+    }
+    if not args.skip_api:
+        cases["import api"] = lambda: time_import("api")
+        cases["uvicorn api:app -> GET /"] = time_uvicorn
+
+    print(f"{'Case':<28} | {'Median s':<9} | {'Max s':<8} | {'Budget s':<8} | Status")
+    print("-" * 72)
+    over_budget = False
+    for name, measure in cases.items():
+        samples = [measure() for _ in range(args.runs)]
+        median = statistics.median(samples)
+        ok = median <= BUDGETS[name]
+        over_budget |= not ok
+        print(f"{name:<28} | {median:<9.3f} | {max(samples):<8.3f} | {BUDGETS[name]:<8.2f} | {'🟢 OK' if ok else '🔴 OVER'}")
+    sys.exit(1 if over_budget else 0)
+
+if __name__ == "__main__":
+    main()
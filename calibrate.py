@@ -0,0 +1,376 @@
+# calibrate.py
+# Fit Economy constants to target trajectories / moments.
+#   python calibrate.py calibration/targets.json --out calibration/params.json
+import sys
+import json
+import time
+import hashlib
+import argparse
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import Economy, PARAM_FILE_FORMAT
+from backends import PARAM_NAMES, BatchState, get_backend, HAS_NUMPY
+
+METRICS = ("inflation", "gdp_growth", "unemployment", "exchange_rate", "fx_change_rate", "political_tension")
+ON_BOUND_TOL = 1e-3 # fraction of a free parameter's range
+
+
+# --- Scenario simulation ---
+
+def policy_for_month(policy, month, game):
+    """Resolve the (rate, printer) levers for `month` (0-based) from a scenario policy spec.
+
+    Each lever is a number (constant), a list (one value per month, last one repeats)
+    or, for the rate, a rule {"inflation_plus": k, "min": lo, "max": hi}.
+    """
+    levers = []
+    for key, default in (("rate", 15.0), ("money_printer", 0.0)):
+        spec = policy.get(key, default)
+        if isinstance(spec, list):
+            value = spec[min(month, len(spec) - 1)]
+        elif isinstance(spec, dict):
+            # game.inflation is an array for a batch: clip with the game's own backend
+            value = game.backend._clip(game.inflation + spec.get("inflation_plus", 0.0),
+                                       spec.get("min", float("-inf")), spec.get("max", float("inf")))
+        else:
+            value = float(spec)
+        levers.append(value)
+    return tuple(levers)
+
+
+def simulate_scenario(scenario, params, backend="reference"):
+    """Run one deterministic scenario (no random events). Returns {metric: [value per month]}."""
+    start = Economy(
+        fixed_gov_type=scenario["gov_type"],
+        initial_inflation=scenario.get("initial_inflation", 15.0),
+        initial_gdp=scenario.get("initial_gdp", 2.0),
+        params=params,
+        backend=backend,
+    )
+    # Throwaway run: skip the per-turn snapshots
+    game = Economy.from_snapshot(start.head, simulation=True)
+    paths = {metric: [] for metric in METRICS}
+    for month in range(scenario["months"]):
+        rate, printer = policy_for_month(scenario.get("policy", {}), month, game)
+        game.next_turn(rate, printer, is_simulation=True)
+        for metric in METRICS:
+            paths[metric].append(getattr(game, metric))
+    return paths
+
+
+# Political tension is not part of the step kernel (it lives on Economy), so a batch can't track it
+BATCH_METRICS = METRICS[:-1]
+
+
+def simulate_batch(scenario, param_sets):
+    """simulate_scenario for many parameter sets at once: one numpy step per month for the
+    whole batch. Returns one {metric: [value per month]} per set, without political_tension."""
+    np = get_backend("numpy").np
+    start = Economy(
+        fixed_gov_type=scenario["gov_type"],
+        initial_inflation=scenario.get("initial_inflation", 15.0),
+        initial_gdp=scenario.get("initial_gdp", 2.0),
+    )
+    batch = BatchState.from_economies([start] * len(param_sets))
+    batch.backend = get_backend("numpy")
+    batch.policy_history = list(start.policy_history)
+    params = {name: np.array([p[name] for p in param_sets], dtype=np.float64) for name in PARAM_NAMES}
+
+    paths = {metric: [] for metric in BATCH_METRICS}
+    for month in range(scenario["months"]):
+        rate, printer = policy_for_month(scenario.get("policy", {}), month, batch)
+        batch.policy_history.append(rate)
+        effective_rate = Economy._calculate_effective_rate(batch)
+        batch.backend.step(batch, params, start.gov.profile, effective_rate, printer)
+        batch.backend.clamp(batch, params)
+        for metric in BATCH_METRICS:
+            paths[metric].append(getattr(batch, metric).copy()) # the kernel updates arrays in place
+    columns = {metric: np.stack(values, axis=1).tolist() for metric, values in paths.items()}
+    return [{metric: columns[metric][i] for metric in BATCH_METRICS} for i in range(len(param_sets))]
+
+
+# --- Loss ---
+
+def target_loss(target, paths):
+    """Squared (weighted) miss for a single target, plus the observed value(s)."""
+    path = paths[target["metric"]]
+    weight = target.get("weight", 1.0)
+    if "path" in target:
+        expected = target["path"]
+        errors = [(path[i] - expected[i]) ** 2 for i in range(min(len(path), len(expected)))]
+        return weight * sum(errors) / len(errors), path[:len(expected)]
+
+    observed = path[target["month"] - 1]
+    op, value = target.get("op", "="), target["value"]
+    if op == "<":
+        miss = max(0.0, observed - value)
+    elif op == ">":
+        miss = max(0.0, value - observed)
+    elif op == "=":
+        miss = observed - value
+    else:
+        raise ValueError(f"Unknown target op '{op}' (use <, > or =)")
+    return weight * miss ** 2, observed
+
+
+def evaluate(spec, params):
+    """Total loss and per-target breakdown for one parameter set."""
+    total, breakdown = 0.0, []
+    backend = spec.get("backend", "reference")
+    runs = {}
+    for target in spec["targets"]:
+        name = target["scenario"]
+        if name not in runs:
+            runs[name] = simulate_scenario(spec["scenarios"][name], params, backend)
+        loss, observed = target_loss(target, runs[name])
+        total += loss
+        breakdown.append({"target": target, "observed": observed, "loss": loss})
+    return total, breakdown
+
+
+def can_batch(spec):
+    return HAS_NUMPY and all(target["metric"] in BATCH_METRICS for target in spec["targets"])
+
+
+def evaluate_batch(spec, candidates):
+    """Total loss of each candidate. Runs every scenario once for the whole batch when it can
+    (numpy installed, no political_tension targets), else one Economy per candidate."""
+    if not can_batch(spec):
+        return [evaluate(spec, params)[0] for params in candidates]
+    runs = {}
+    totals = [0.0] * len(candidates)
+    for target in spec["targets"]:
+        name = target["scenario"]
+        if name not in runs:
+            runs[name] = simulate_batch(spec["scenarios"][name], candidates)
+        for i, paths in enumerate(runs[name]):
+            totals[i] += target_loss(target, paths)[0]
+    return totals
+
+
+def _evaluate_batch(args):
+    """Worker entry point: a batch of candidate parameter sets against every scenario."""
+    spec, candidates = args
+    return evaluate_batch(spec, candidates)
+
+
+# --- Optimizer (parallel compass search, derivative-free) ---
+
+class CompassSearch:
+    """Polls +/- step along every free parameter each round, all points evaluated in parallel.
+
+    Works in a normalized [0, 1] box built from the "free" bounds, so one step size fits all.
+    With "prior_weight" > 0 the objective adds weight * (squared distance from the start in
+    that box): among parameter sets that fit equally well, the one closest to the current
+    constants wins, instead of whichever the search stumbled on first (often a bound).
+    """
+
+    def __init__(self, spec, base_params, workers=None, batch_size=4, initial_step=0.25, min_step=1e-3, max_evals=2000):
+        self.spec = spec
+        self.base_params = base_params
+        self.free = spec["free"]
+        self.names = sorted(self.free)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.initial_step = initial_step
+        self.min_step = min_step
+        self.max_evals = max_evals
+        self.prior_weight = spec.get("prior_weight", 0.0)
+        self.origin = self.to_unit(base_params)
+        self.evals = 0
+
+    def to_params(self, x):
+        params = dict(self.base_params)
+        for name, u in zip(self.names, x):
+            low, high = self.free[name]
+            params[name] = low + u * (high - low)
+        return params
+
+    def to_unit(self, params):
+        x = []
+        for name in self.names:
+            low, high = self.free[name]
+            x.append(0.0 if high == low else min(1.0, max(0.0, (params[name] - low) / (high - low))))
+        return x
+
+    def _evaluate_points(self, pool, points):
+        candidates = [self.to_params(x) for x in points]
+        batches = [(self.spec, candidates[i:i + self.batch_size]) for i in range(0, len(candidates), self.batch_size)]
+        results = pool.map(_evaluate_batch, batches) if pool else map(_evaluate_batch, batches)
+        self.evals += len(candidates)
+        losses = [loss for batch in results for loss in batch]
+        if self.prior_weight:
+            losses = [
+                loss + self.prior_weight * sum((u - u0) ** 2 for u, u0 in zip(x, self.origin))
+                for loss, x in zip(losses, points)
+            ]
+        return losses
+
+    def run(self, log=print):
+        x = self.to_unit(self.base_params)
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers != 1 else None
+        try:
+            best = self._evaluate_points(pool, [x])[0]
+            step, rounds = self.initial_step, 0
+            while step >= self.min_step and self.evals < self.max_evals and best > 0.0:
+                rounds += 1
+                poll = []
+                for i in range(len(x)):
+                    for direction in (1.0, -1.0):
+                        point = list(x)
+                        point[i] = min(1.0, max(0.0, point[i] + direction * step))
+                        if point != x:
+                            poll.append(point)
+                losses = self._evaluate_points(pool, poll)
+                i_best = min(range(len(losses)), key=losses.__getitem__) if losses else None
+                if i_best is not None and losses[i_best] < best:
+                    x, best = poll[i_best], losses[i_best]
+                else:
+                    step /= 2.0
+                log(f"round {rounds:<4} | evals {self.evals:<6} | step {step:<8.4f} | loss {best:.6f}")
+        finally:
+            if pool:
+                pool.shutdown()
+        return self.to_params(x), best
+
+
+# --- Output ---
+
+def params_on_bound(spec, params):
+    """Free parameters the fit left on (or within ON_BOUND_TOL of) one of their bounds."""
+    on_bound = []
+    for name in sorted(spec["free"]):
+        low, high = spec["free"][name]
+        tol = ON_BOUND_TOL * (high - low)
+        if params[name] <= low + tol or params[name] >= high - tol:
+            on_bound.append(name)
+    return on_bound
+
+
+def build_param_file(spec, params, initial_loss, final_loss, breakdown, evals, elapsed):
+    fitted = {name: params[name] for name in sorted(spec["free"])}
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:8]
+    created = datetime.now(timezone.utc)
+    return {
+        "format": PARAM_FILE_FORMAT,
+        "version": f"{created:%Y%m%d-%H%M%S}-{digest}",
+        "created": created.isoformat(timespec="seconds"),
+        "params": params,
+        "fit": {
+            "fitted": fitted,
+            # A parameter pinned to its bound usually means the targets want it outside the range
+            "on_bound": params_on_bound(spec, params),
+            "initial_loss": initial_loss,
+            "final_loss": final_loss,
+            "evaluations": evals,
+            "seconds": round(elapsed, 2),
+            "targets": [
+                {
+                    "name": item["target"].get("name", item["target"]["scenario"]),
+                    "metric": item["target"]["metric"],
+                    "goal": item["target"].get("path") or f"{item['target'].get('op', '=')} {item['target']['value']} @ month {item['target']['month']}",
+                    "observed": item["observed"],
+                    "loss": item["loss"],
+                }
+                for item in breakdown
+            ],
+        },
+    }
+
+
+def print_report(result):
+    fit = result["fit"]
+    print("\n" + "=" * 100)
+    print(f"📐 CALIBRATION REPORT  (version {result['version']})")
+    print(f"Loss: {fit['initial_loss']:.6f} -> {fit['final_loss']:.6f} in {fit['evaluations']} evaluations ({fit['seconds']}s)")
+    print("-" * 100)
+    for name, value in fit["fitted"].items():
+        flag = "  ⚠️ on bound" if name in fit["on_bound"] else ""
+        print(f"{name:<30} = {value:.6g}{flag}")
+    if fit["on_bound"]:
+        print(f"⚠️  {len(fit['on_bound'])} parameter(s) ended on a bound: widen the range or revisit the targets")
+    print("-" * 100)
+    print(f"{'Target':<40} | {'Metric':<12} | {'Goal':<25} | {'Observed':<10} | {'Loss':<10}")
+    print("-" * 100)
+    for row in fit["targets"]:
+        goal = row["goal"] if isinstance(row["goal"], str) else f"path[{len(row['goal'])}]"
+        observed = row["observed"] if isinstance(row["observed"], float) else row["observed"][-1]
+        status = "🟢" if row["loss"] < 1e-3 else "🔴"
+        print(f"{row['name'][:40]:<40} | {row['metric']:<12} | {goal[:25]:<25} | {observed:<10.3f} | {row['loss']:<10.4f} {status}")
+    print("=" * 100)
+
+
+def validate_spec(spec):
+    """Fail fast with a readable error instead of an IndexError deep inside a worker."""
+    free = spec.get("free")
+    if not isinstance(free, dict) or not free:
+        raise ValueError("Spec needs 'free': {parameter: [low, high], ...}")
+    unknown = (set(free) | set(spec.get("base_params", {}))) - set(Economy.default_params())
+    if unknown:
+        raise ValueError(f"Unknown model parameters: {', '.join(sorted(unknown))}")
+    for name, bounds in free.items():
+        if not (isinstance(bounds, (list, tuple)) and len(bounds) == 2 and bounds[0] <= bounds[1]):
+            raise ValueError(f"Free parameter {name}: bounds must be [low, high] with low <= high, got {bounds!r}")
+    if spec.get("prior_weight", 0.0) < 0:
+        raise ValueError(f"prior_weight must be >= 0, got {spec['prior_weight']}")
+
+    scenarios = spec.get("scenarios", {})
+    for i, target in enumerate(spec.get("targets", [])):
+        label = f"Target #{i + 1} ({target.get('name', target.get('scenario'))})"
+        name = target.get("scenario")
+        if name not in scenarios:
+            raise ValueError(f"{label}: unknown scenario {name!r}")
+        if target.get("metric") not in METRICS:
+            raise ValueError(f"{label}: unknown metric {target.get('metric')!r} (use one of {', '.join(METRICS)})")
+        months = scenarios[name]["months"]
+        if "path" in target:
+            if not 1 <= len(target["path"]) <= months:
+                raise ValueError(f"{label}: path needs 1..{months} values, got {len(target['path'])}")
+        else:
+            month = target.get("month")
+            if not isinstance(month, int) or not 1 <= month <= months:
+                raise ValueError(f"{label}: month must be an integer in 1..{months}, got {month!r}")
+            if target.get("op", "=") not in ("<", ">", "="):
+                raise ValueError(f"{label}: unknown op {target['op']!r} (use <, > or =)")
+            if "value" not in target:
+                raise ValueError(f"{label}: missing 'value'")
+    if not spec.get("targets"):
+        raise ValueError("Spec has no targets")
+
+
+def calibrate(spec, workers=None, batch_size=4, max_evals=2000, log=print):
+    validate_spec(spec)
+    base = Economy.default_params()
+    base.update(spec.get("base_params", {}))
+
+    start = time.perf_counter()
+    initial_loss, _ = evaluate(spec, base)
+    search = CompassSearch(spec, base, workers=workers, batch_size=batch_size, max_evals=max_evals)
+    params, _ = search.run(log=log)
+    final_loss, breakdown = evaluate(spec, params)
+    return build_param_file(spec, params, initial_loss, final_loss, breakdown, search.evals, time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibrate Taraz economy constants against targets")
+    parser.add_argument("targets", help="JSON file with scenarios, targets and free parameter bounds")
+    parser.add_argument("--out", help="Where to write the versioned parameter file")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (1 = no pool)")
+    parser.add_argument("--batch-size", type=int, default=4, help="Candidates per worker task")
+    parser.add_argument("--max-evals", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    with open(args.targets, encoding="utf-8") as f:
+        spec = json.load(f)
+
+    result = calibrate(spec, workers=args.workers, batch_size=args.batch_size, max_evals=args.max_evals)
+    print_report(result)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"Saved parameters to {args.out}")
+    return result
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,5 +1,23 @@
 import random
 import copy
+import json
+import functools
+import threading
+from collections import namedtuple
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from backends import PARAM_NAMES, get_backend
+
+PARAM_FILE_FORMAT = 1
+
+def load_param_file(path):
+    """Read a versioned parameter file (as written by calibrate.py) and return its params dict."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("format") != PARAM_FILE_FORMAT:
+        raise ValueError(f"Unsupported parameter file format: {data.get('format')!r}")
+    return data["params"]
 
 class Government:
     TYPES = {
@@ -33,6 +51,58 @@ class Government:
         self.profile = self.TYPES[self.type_key]
         self.name = self.profile["name_fa"]
 
+# Per-turn log, one entry per real (non-simulated) turn
+HISTORY_FIELDS = ("turn", "inflation", "gdp", "unemployment", "rate", "fx")
+
+# Game state captured at one turn. Immutable; `parent` links back to the previous turn,
+# so branches forked from the same turn share every snapshot (and history row) before it.
+SNAPSHOT_FIELDS = (
+    "inflation", "gdp_growth", "unemployment", "exchange_rate", "fx_change_rate",
+    "money_supply_index", "turn", "political_tension", "gov_message", "active_events",
+    "game_over_status", "params", "backend",
+)
+
+_SCALARS = (int, float, str, type(None))
+
+def _freeze(value):
+    """Deep read-only copy: dicts become mappingproxies, lists become tuples."""
+    if isinstance(value, _SCALARS): # most fields; skips the slower ABC check below
+        return value
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def _thaw(value):
+    """Inverse of _freeze: fresh dicts and lists the live game is free to mutate."""
+    if isinstance(value, _SCALARS):
+        return value
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+def _locked(method):
+    """Run `method` holding the game's lock: API requests on one game arrive from a threadpool."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+class Snapshot(namedtuple("Snapshot", ("parent", "gov_type", "policy_tail", "record") + SNAPSHOT_FIELDS)):
+    __slots__ = ()
+
+    def chain(self):
+        """Snapshots from the start of the game up to this one."""
+        node, nodes = self, []
+        while node is not None:
+            nodes.append(node)
+            node = node.parent
+        return nodes[::-1]
+
 class Economy:
     # --- Tuning Constants ---
     TARGET_INFLATION = 3.0
@@ -46,6 +116,9 @@ class Economy:
     GLOBAL_INTEREST_RATE = 2.0
     SENSITIVITY_FX = 0.1          
     PASS_THROUGH_COEF = 0.2       
+    DEPRECIATION_ANCHOR = 2.0
+    SENSITIVITY_DEPRECIATION = 0.05
+    SENSITIVITY_EXPORT_GDP = 0.03
     
     SENSITIVITY_MONEY_INFLATION = 0.15
     SENSITIVITY_MONEY_GDP = 0.15
@@ -59,9 +132,12 @@ class Economy:
     MIN_INFLATION, MAX_INFLATION = -10.0, 200.0
     MIN_UNEMPLOYMENT, MAX_UNEMPLOYMENT = 2.0, 50.0
     MIN_GDP, MAX_GDP = -15.0, 15.0
+    MIN_EXCHANGE_RATE = 1000.0
     MAX_TURNS = 48
 
-    def __init__(self, fixed_gov_type=None, initial_inflation=15.0, initial_gdp=2.0):
+    def __init__(self, fixed_gov_type=None, initial_inflation=15.0, initial_gdp=2.0, params=None, backend="reference"):
+        self._lock = threading.RLock()
+        self._keep_snapshots = True
         self.inflation = initial_inflation
         self.gdp_growth = initial_gdp
         self.unemployment = 10.0
@@ -72,19 +148,39 @@ class Economy:
         self.turn = 1
         initial_rate = 15.0
         self.policy_history = [initial_rate, initial_rate, initial_rate]
-        self.history = []
         self.active_events = []
         
         self.political_tension = 0.0
         self.gov_message = "دولت وضعیت را رصد می‌کند."
         
         self.gov = Government(fixed_gov_type)
+
+        self.params = self.default_params()
+        if params: self.set_params(params)
+        self.backend = get_backend(backend)
         
         self.game_over_status = {
             "is_game_over": False,
             "reason": {"en": "", "fa": ""},
             "type": "none"
         }
+        self.head = self._take_snapshot(None)
+
+    @classmethod
+    def default_params(cls):
+        return {name: getattr(cls, name) for name in PARAM_NAMES}
+
+    @_locked
+    def set_params(self, overrides):
+        """Hot-swap model parameters for this game. The Government is kept."""
+        unknown = set(overrides) - set(PARAM_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown model parameters: {', '.join(sorted(unknown))}")
+        # Replace rather than mutate, so a params dict handed out earlier never changes under its holder
+        self.params = {**self.params, **overrides}
+
+    def set_backend(self, backend):
+        self.backend = get_backend(backend)
 
     def _calculate_effective_rate(self):
         rates = self.policy_history[-3:]
@@ -158,44 +254,13 @@ class Economy:
         advisors.append({"name": {"en": "Technocrat", "fa": "تکنوکرات"}, "msg": tech_msg, "type": "techno"})
         return advisors
 
+    @_locked
     def next_turn(self, policy_interest_rate: float, money_printer: float = 0.0, is_simulation: bool = False):
         self.policy_history.append(policy_interest_rate)
-        if not is_simulation: self._log_history(policy_interest_rate)
+        record = None if is_simulation else self._history_row(policy_interest_rate)
 
         effective_rate = self._calculate_effective_rate()
-        self.money_supply_index += money_printer
-        
-        # FX Logic
-        rate_differential = effective_rate - self.GLOBAL_INTEREST_RATE
-        natural_depreciation = (self.inflation - 2.0) * 0.05
-        capital_flow_effect = rate_differential * self.SENSITIVITY_FX
-        money_supply_shock = money_printer * self.SENSITIVITY_MONEY_FX
-        self.fx_change_rate = natural_depreciation - capital_flow_effect + money_supply_shock
-        self.exchange_rate = self.exchange_rate * (1 + (self.fx_change_rate / 100.0))
-        self.exchange_rate = max(1000.0, self.exchange_rate)
-
-        # Core Physics
-        real_rate_gap = effective_rate - self.inflation
-        gov_inflation = self.gov.profile["inflation_bias"]
-        inflation_delta = -(real_rate_gap * self.SENSITIVITY_INFLATION)
-        import_inflation = self.fx_change_rate * self.PASS_THROUGH_COEF
-        monetary_inflation = money_printer * self.SENSITIVITY_MONEY_INFLATION
-        inflation_gravity = (self.TARGET_INFLATION - self.inflation) * self.GRAVITY_INFLATION
-        
-        self.inflation += (inflation_delta + import_inflation + monetary_inflation + inflation_gravity + gov_inflation)
-
-        gov_spending = self.gov.profile["budget_bias"]
-        gdp_pressure = -(real_rate_gap * self.SENSITIVITY_GDP)
-        export_boost = self.fx_change_rate * 0.03
-        monetary_stimulus = money_printer * self.SENSITIVITY_MONEY_GDP
-        gdp_gravity = (self.TARGET_GDP_GROWTH - self.gdp_growth) * self.GRAVITY_GDP
-        
-        self.gdp_growth += (gdp_pressure + export_boost + monetary_stimulus + gdp_gravity + gov_spending)
-
-        gdp_gap = self.TARGET_GDP_GROWTH - self.gdp_growth
-        unemployment_delta = (gdp_gap * self.SENSITIVITY_UNEMPLOYMENT)
-        unemployment_gravity = (self.TARGET_UNEMPLOYMENT - self.unemployment) * self.GRAVITY_UNEMPLOYMENT
-        self.unemployment += (unemployment_delta + unemployment_gravity)
+        self.backend.step(self, self.params, self.gov.profile, effective_rate, money_printer)
 
         if not is_simulation:
             self.active_events = self._process_random_events()
@@ -204,9 +269,7 @@ class Economy:
             self.active_events = []
             self._update_political_tension(policy_interest_rate)
 
-        self.inflation = max(self.MIN_INFLATION, min(self.MAX_INFLATION, self.inflation))
-        self.unemployment = max(self.MIN_UNEMPLOYMENT, min(self.MAX_UNEMPLOYMENT, self.unemployment))
-        self.gdp_growth = max(self.MIN_GDP, min(self.MAX_GDP, self.gdp_growth))
+        self.backend.clamp(self, self.params)
         self.turn += 1
         
         # Game Over Logic
@@ -220,6 +283,9 @@ class Economy:
             elif self.turn > self.MAX_TURNS:
                 self.game_over_status = {"is_game_over": True, "type": "win", "reason": {"en": "Victory", "fa": "پیروزی"}}
 
+        if self._keep_snapshots:
+            self.head = self._take_snapshot(self.head, record)
+
         return {
             "turn": self.turn,
             "inflation": round(self.inflation, 2),
@@ -238,27 +304,113 @@ class Economy:
             "advisors": self._get_advisor_report(policy_interest_rate)
         }
 
-    def _log_history(self, policy_rate):
-        self.history.append({
-            "turn": self.turn,
-            "inflation": self.inflation,
-            "gdp": self.gdp_growth,
-            "unemployment": self.unemployment,
-            "rate": policy_rate,
-            "fx": self.exchange_rate
-        })
+    def _history_row(self, policy_rate):
+        # Stored as a bare tuple in HISTORY_FIELDS order: one per turn, shared across branches
+        return (self.turn, self.inflation, self.gdp_growth, self.unemployment, policy_rate, self.exchange_rate)
+
+    @property
+    def history(self):
+        return [dict(zip(HISTORY_FIELDS, s.record)) for s in self.head.chain() if s.record is not None]
+
+    def has_history(self):
+        """True once a turn has been logged. Walks back only as far as the latest row."""
+        node = self.head
+        while node is not None:
+            if node.record is not None:
+                return True
+            node = node.parent
+        return False
+
+    def history_columns(self, start=None, end=None):
+        """Logged turns in [start, end] as columns: {"turn": [...], "inflation": [...], ...}."""
+        rows = [s.record for s in self.head.chain() if s.record is not None]
+        rows = [r for r in rows if (start is None or r[0] >= start) and (end is None or r[0] <= end)]
+        return {name: [r[i] for r in rows] for i, name in enumerate(HISTORY_FIELDS)}
+
+    # --- Snapshots & Branching ---
+
+    def _frozen_state(self, parent):
+        state = {}
+        for name in SNAPSHOT_FIELDS:
+            value = getattr(self, name)
+            # Params, game over status and the message rarely change between turns:
+            # reuse the parent's frozen copy so the chain shares one
+            if parent is not None and isinstance(value, dict) and getattr(parent, name) == value:
+                state[name] = getattr(parent, name)
+            else:
+                state[name] = _freeze(value)
+        return state
+
+    def _take_snapshot(self, parent, record=None):
+        return Snapshot(
+            parent=parent,
+            gov_type=self.gov.type_key,
+            policy_tail=tuple(self.policy_history[-3:]) if parent else tuple(self.policy_history),
+            record=record,
+            **self._frozen_state(parent)
+        )
+
+    @_locked
+    def snapshot(self):
+        """Current state as an immutable Snapshot (picks up any direct edits since the last turn)."""
+        current = self._frozen_state(self.head)
+        if any(getattr(self.head, name) != value for name, value in current.items()):
+            self.head = self.head._replace(**current)
+        return self.head
+
+    def snapshot_at(self, turn):
+        for snap in self.snapshot().chain():
+            if snap.turn == turn:
+                return snap
+        raise ValueError(f"No snapshot for turn {turn} (game is at turn {self.turn})")
+
+    @_locked
+    def restore(self, snapshot):
+        """Rewind (or fast-forward) this game to `snapshot`. Earlier snapshots are shared, not copied."""
+        for name in SNAPSHOT_FIELDS:
+            setattr(self, name, _thaw(getattr(snapshot, name)))
+        self.gov = Government(snapshot.gov_type)
+        chain = snapshot.chain()
+        self.policy_history = list(chain[0].policy_tail) + [s.policy_tail[-1] for s in chain[1:]]
+        self.head = snapshot
+
+    @classmethod
+    def from_snapshot(cls, snapshot, simulation=False):
+        """Game resumed from `snapshot`. A `simulation` game takes no snapshots of its own:
+        it is cheaper to step, but its head stays at `snapshot`, so it can't be forked or rewound."""
+        game = cls.__new__(cls)
+        game._lock = threading.RLock()
+        game._keep_snapshots = not simulation
+        game.restore(snapshot)
+        return game
+
+    def fork(self, turn=None):
+        """New independent game branching off this one at `turn` (default: now)."""
+        return Economy.from_snapshot(self.snapshot() if turn is None else self.snapshot_at(turn))
+
+    @_locked
+    def forecast_key(self):
+        """Hashable fingerprint of everything simulate_future depends on. Equal keys, equal forecasts."""
+        return (
+            self.gov.type_key, self.turn, self.inflation, self.gdp_growth, self.unemployment,
+            self.exchange_rate, self.fx_change_rate, tuple(self.policy_history[-3:]),
+            self.backend.name, tuple(sorted(self.params.items())),
+        )
+
+    def _detached_snapshot(self):
+        """Current state as a parentless Snapshot. Unlike snapshot(), never touches self.head."""
+        with self._lock:
+            return Snapshot(
+                parent=None,
+                gov_type=self.gov.type_key,
+                policy_tail=tuple(self.policy_history[-3:]),
+                record=None,
+                **self._frozen_state(self.head)
+            )
 
     def simulate_future(self, policy_rate: float, money_printer: float, months: int = 6):
-        sim_economy = Economy(fixed_gov_type=self.gov.type_key)
-        sim_economy.inflation = self.inflation
-        sim_economy.gdp_growth = self.gdp_growth
-        sim_economy.unemployment = self.unemployment
-        sim_economy.exchange_rate = self.exchange_rate
-        sim_economy.fx_change_rate = self.fx_change_rate
-        sim_economy.money_supply_index = self.money_supply_index
-        sim_economy.turn = self.turn
-        sim_economy.policy_history = self.policy_history[:]
-        sim_economy.political_tension = self.political_tension
+        # Only the copy is taken under the lock; the forecast itself runs on the detached game
+        sim_economy = Economy.from_snapshot(self._detached_snapshot(), simulation=True)
         
         forecast_data = []
         for _ in range(months):
@@ -0,0 +1,152 @@
+# history.py
+# Columnar game histories: downsampling for the API, persistence, and offline aggregation.
+#   python history.py games.jsonl --chunk-size 1000
+import sys
+import json
+import math
+import argparse
+import threading
+from itertools import islice
+
+_write_lock = threading.Lock()
+
+
+def downsample(columns, every=1, max_points=None):
+    """Keep every `every`-th turn (or enough to fit `max_points`). The latest turn is always kept."""
+    n = len(columns["turn"])
+    if max_points:
+        every = max(every, math.ceil(n / max_points))
+    if every <= 1 or n == 0:
+        return columns
+    keep = list(range(0, n, every))
+    if keep[-1] != n - 1:
+        keep.append(n - 1)
+        if max_points and len(keep) > max_points:
+            del keep[-2]
+    return {name: [values[i] for i in keep] for name, values in columns.items()}
+
+
+# --- Persistence (JSON Lines, one game per line, columnar) ---
+
+def game_record(game, game_id, outcome=None):
+    status = game.game_over_status
+    columns = game.history_columns()
+    return {
+        "game_id": game_id,
+        "gov_type": game.gov.type_key,
+        "outcome": outcome or status["type"],
+        "reason": status["reason"]["en"],
+        # Logged turns only: /state steps `turn` via simulated turns that write no row
+        "turns": len(columns["turn"]),
+        "columns": columns,
+    }
+
+
+def append_game(path, record):
+    line = json.dumps(record, ensure_ascii=False)
+    with _write_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+def iter_chunks(path, chunk_size=1000):
+    """Yield lists of at most `chunk_size` game records; only one chunk is in memory at a time."""
+    with open(path, encoding="utf-8") as f:
+        while True:
+            lines = list(islice(f, chunk_size))
+            if not lines:
+                return
+            yield [json.loads(line) for line in lines if line.strip()]
+
+
+# --- Offline aggregation ---
+
+class HistoryAggregator:
+    """Cross-game statistics built incrementally. Game records are never held: apart from
+    the set of seen game ids, memory depends on months and government types only."""
+
+    def __init__(self):
+        self.games = 0
+        self.seen = set()         # game ids only, to skip a game written more than once
+        self.outcomes = {}        # gov_type -> {"lose_pol: Fired": count, ...}
+        self.inflation_sum = []   # per logged month (index 0 = first logged turn)
+        self.inflation_count = []
+
+    def add(self, record):
+        if record["game_id"] in self.seen:
+            return
+        self.seen.add(record["game_id"])
+        self.games += 1
+        by_gov = self.outcomes.setdefault(record["gov_type"], {})
+        cause = record["outcome"] if not record.get("reason") else f"{record['outcome']}: {record['reason']}"
+        by_gov[cause] = by_gov.get(cause, 0) + 1
+
+        columns = record["columns"]
+        # Month = position among the logged rows, not the turn number: /state advances
+        # `turn` without logging, so turn numbers can have gaps
+        for month, inflation in enumerate(columns["inflation"]):
+            while len(self.inflation_sum) <= month:
+                self.inflation_sum.append(0.0)
+                self.inflation_count.append(0)
+            self.inflation_sum[month] += inflation
+            self.inflation_count[month] += 1
+
+    def result(self):
+        loss_causes = {}
+        for gov_type, counts in self.outcomes.items():
+            total = sum(counts.values())
+            loss_causes[gov_type] = {
+                cause: {"count": count, "share": round(count / total, 4)}
+                for cause, count in sorted(counts.items(), key=lambda kv: -kv[1])
+            }
+        return {
+            "games": self.games,
+            "outcomes_by_gov": loss_causes,
+            "avg_inflation_by_month": [
+                {"month": month + 1, "inflation": round(total / count, 3), "games": count}
+                for month, (total, count) in enumerate(zip(self.inflation_sum, self.inflation_count))
+                if count
+            ],
+        }
+
+
+def aggregate(path, chunk_size=1000):
+    aggregator = HistoryAggregator()
+    for chunk in iter_chunks(path, chunk_size):
+        for record in chunk:
+            aggregator.add(record)
+    return aggregator.result()
+
+
+def print_report(stats):
+    print("=" * 80)
+    print(f"📊 {stats['games']} games")
+    print("-" * 80)
+    print(f"{'Government':<12} | {'Outcome':<30} | {'Count':<7} | {'Share':<7}")
+    print("-" * 80)
+    for gov_type, causes in sorted(stats["outcomes_by_gov"].items()):
+        for cause, row in causes.items():
+            print(f"{gov_type:<12} | {cause:<30} | {row['count']:<7} | {row['share']:<7.1%}")
+    print("-" * 80)
+    print(f"{'Month':<5} | {'Avg Infl%':<10} | {'Games':<7}")
+    print("-" * 80)
+    for row in stats["avg_inflation_by_month"]:
+        print(f"{row['month']:<5} | {row['inflation']:<10.2f} | {row['games']:<7}")
+    print("=" * 80)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate persisted Taraz game histories")
+    parser.add_argument("path", help="JSON Lines file written by the API (TARAZ_HISTORY_FILE)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Games read per chunk")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON instead of tables")
+    args = parser.parse_args(argv)
+
+    stats = aggregate(args.path, args.chunk_size)
+    if args.json:
+        print(json.dumps(stats, indent=2, ensure_ascii=False))
+    else:
+        print_report(stats)
+    return stats
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
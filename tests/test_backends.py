@@ -0,0 +1,92 @@
+import sys
+import os
+import unittest
+
+# Setup path to import engine
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from engine import Economy, Government
+from backends import BatchState, get_backend, HAS_NUMPY
+
+# Scripted (rate, printer) paths that push the model into every regime, bounds included
+SCRIPTS = {
+    "contraction": [(25.0, -10.0)] * 24,
+    "expansion": [(5.0, 10.0)] * 24,
+    "panic": [(0.0, 20.0)] * 24,
+    "zigzag": [(40.0, -20.0), (0.0, 30.0)] * 12,
+}
+
+
+RAW_FIELDS = ("inflation", "gdp_growth", "unemployment", "exchange_rate", "fx_change_rate", "political_tension")
+
+
+def run_script(gov_type, script, backend):
+    """Raw (unrounded) trajectory, so rounding in the response can't mask or fake a divergence."""
+    game = Economy(fixed_gov_type=gov_type, backend=backend)
+    trajectory = []
+    for rate, printer in script:
+        state = game.next_turn(rate, printer, is_simulation=True)
+        trajectory.append(dict({f: float(getattr(game, f)) for f in RAW_FIELDS}, turn=state["turn"], is_game_over=state["is_game_over"]))
+    return trajectory
+
+
+class TestBackendParity(unittest.TestCase):
+    """Every backend must reproduce the reference trajectories."""
+
+    def assert_parity(self, backend):
+        for gov_type in Government.TYPES:
+            for name, script in SCRIPTS.items():
+                with self.subTest(gov=gov_type, script=name):
+                    expected = run_script(gov_type, script, "reference")
+                    actual = run_script(gov_type, script, backend)
+                    for exp, act in zip(expected, actual):
+                        for key in RAW_FIELDS:
+                            self.assertAlmostEqual(exp[key], act[key], delta=1e-9 * max(1.0, abs(exp[key])), msg=f"{key} @ turn {exp['turn']}")
+                        self.assertEqual(exp["is_game_over"], act["is_game_over"])
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+    def test_numpy_single_game(self):
+        self.assert_parity("numpy")
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+    def test_numpy_batch_matches_per_game_loop(self):
+        import numpy as np
+        reference, vectorized = get_backend("reference"), get_backend("numpy")
+        games = [Economy(fixed_gov_type=g, initial_inflation=5.0 + 10 * i) for i, g in enumerate(Government.TYPES)]
+        batch = BatchState.from_economies(games)
+        profile = {
+            "inflation_bias": np.array([g.gov.profile["inflation_bias"] for g in games]),
+            "budget_bias": np.array([g.gov.profile["budget_bias"] for g in games]),
+        }
+        params = Economy.default_params()
+        for rate, printer in SCRIPTS["zigzag"]:
+            for game in games:
+                reference.step(game, params, game.gov.profile, rate, printer)
+                reference.clamp(game, params)
+            vectorized.step(batch, params, profile, rate, printer)
+            vectorized.clamp(batch, params)
+        for i, game in enumerate(games):
+            self.assertAlmostEqual(game.inflation, batch.inflation[i], places=9)
+            self.assertAlmostEqual(game.exchange_rate, batch.exchange_rate[i], places=6)
+
+
+class TestParamSwap(unittest.TestCase):
+
+    def test_hot_swap_keeps_government(self):
+        game = Economy(fixed_gov_type="Liberal")
+        gov = game.gov
+        game.set_params({"GRAVITY_INFLATION": 0.5, "MAX_INFLATION": 20.0})
+        game.next_turn(0.0, 20.0, is_simulation=True)
+        self.assertIs(game.gov, gov)
+        self.assertLessEqual(game.inflation, 20.0)
+        self.assertEqual(Economy.GRAVITY_INFLATION, Economy.default_params()["GRAVITY_INFLATION"])
+
+    def test_unknown_param_rejected(self):
+        with self.assertRaises(ValueError):
+            Economy().set_params({"GRAVITY_TYPO": 1.0})
+
+    def test_unknown_backend_rejected(self):
+        with self.assertRaises(ValueError):
+            Economy(backend="fortran")
+
+if __name__ == '__main__':
+    unittest.main()
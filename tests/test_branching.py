@@ -0,0 +1,162 @@
+import sys
+import os
+import unittest
+import threading
+import importlib.util
+
+# Setup path to import engine
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from engine import Economy
+
+
+class TestSnapshotsAndBranching(unittest.TestCase):
+
+    def play(self, game, rates):
+        for rate in rates:
+            game.next_turn(rate, 0.0, is_simulation=True)
+
+    def test_fork_replays_identically(self):
+        """A fork at turn N, fed the same policies, must land exactly where the original did."""
+        game = Economy(fixed_gov_type="Welfare")
+        self.play(game, [20.0] * 4)
+        fork = game.fork(turn=3)
+        self.play(game, [30.0] * 6)
+        self.play(fork, [20.0] * 2 + [30.0] * 6)
+        self.assertEqual(fork.turn, game.turn)
+        self.assertEqual(fork.inflation, game.inflation)
+        self.assertEqual(fork.policy_history, game.policy_history)
+
+    def test_branches_share_history(self):
+        game = Economy(fixed_gov_type="Populist")
+        for _ in range(10):
+            game.next_turn(18.0, 0.0)
+        branches = [game.fork(turn=6) for _ in range(5)]
+        for i, branch in enumerate(branches):
+            branch.next_turn(5.0 * i, 0.0)
+
+        shared = game.snapshot_at(6)
+        for branch in branches:
+            self.assertIs(branch.head.parent, shared)
+            # Rows before the fork are the very same objects, not copies
+            self.assertIs(branch.snapshot_at(2).record, game.snapshot_at(2).record)
+            self.assertEqual(len(branch.history), 6)
+        self.assertEqual(len(game.history), 10)
+
+    def test_snapshots_are_immutable(self):
+        game = Economy()
+        snap = game.snapshot()
+        with self.assertRaises(AttributeError):
+            snap.inflation = 99.0
+        game.next_turn(40.0, -10.0)
+        self.assertEqual(snap.inflation, 15.0)
+
+    def test_nested_snapshot_state_is_not_shared(self):
+        game = Economy(fixed_gov_type="Austerity")
+        for _ in range(3):
+            game.next_turn(40.0, 0.0)
+        snap = game.snapshot()
+        fork = game.fork()
+        self.assertIsNot(fork.params, game.params)
+        self.assertIsNot(fork.game_over_status, game.game_over_status)
+
+        # In-place edits on the live game or a fork must not leak into history or other branches
+        game.params["GRAVITY_GDP"] = 99.0
+        game.game_over_status["reason"]["en"] = "tampered"
+        game.active_events.append({"title": "tampered"})
+        fork.params["GRAVITY_INFLATION"] = 99.0
+        self.assertEqual(snap.params["GRAVITY_GDP"], Economy.GRAVITY_GDP)
+        self.assertEqual(snap.params["GRAVITY_INFLATION"], Economy.GRAVITY_INFLATION)
+        self.assertEqual(snap.game_over_status["reason"]["en"], "")
+        self.assertNotIn({"title": "tampered"}, snap.active_events)
+        self.assertEqual(game.fork(turn=snap.turn).params["GRAVITY_INFLATION"], Economy.GRAVITY_INFLATION)
+
+        with self.assertRaises(TypeError):
+            snap.params["GRAVITY_GDP"] = 1.0
+        with self.assertRaises(TypeError):
+            snap.game_over_status["reason"]["en"] = "x"
+
+        # The restored game gets plain, mutable containers back
+        restored = Economy.from_snapshot(snap)
+        restored.game_over_status["type"] = "none"
+        restored.active_events.append({})
+
+    def test_rewind_in_place(self):
+        game = Economy(fixed_gov_type="Austerity")
+        game.inflation += 10.0 # direct edit, picked up by the next snapshot
+        before = game.snapshot()
+        self.play(game, [40.0] * 5)
+        game.restore(before)
+        self.assertEqual(game.turn, 1)
+        self.assertEqual(game.inflation, 25.0)
+        self.assertEqual(game.policy_history, [15.0, 15.0, 15.0])
+        with self.assertRaises(ValueError):
+            game.snapshot_at(5)
+
+    def test_forecast_leaves_live_game_alone(self):
+        game = Economy(fixed_gov_type="Welfare")
+        self.play(game, [20.0] * 3)
+        game.inflation += 5.0 # direct edit, not yet snapshotted
+        head = game.head
+        game.simulate_future(25.0, 0.0)
+        self.assertIs(game.head, head)
+        self.assertEqual(game.turn, 4)
+
+    def test_simulation_games_skip_snapshots(self):
+        game = Economy(fixed_gov_type="Austerity")
+        self.play(game, [30.0] * 4)
+        sim = Economy.from_snapshot(game.snapshot(), simulation=True)
+        fork = game.fork()
+        self.play(sim, [25.0] * 6)
+        self.play(fork, [25.0] * 6)
+        self.assertIs(sim.head, game.head)
+        self.assertEqual(sim.inflation, fork.inflation)
+        self.assertEqual(sim.political_tension, fork.political_tension)
+        self.assertEqual(game.simulate_future(25.0, 0.0)[-1]["inflation"], round(fork.inflation, 2))
+
+    def test_concurrent_turns_and_forecasts_keep_history_linear(self):
+        game = Economy(fixed_gov_type="Populist")
+
+        def play():
+            for _ in range(20):
+                game.next_turn(18.0, 0.0)
+
+        def forecast():
+            for _ in range(20):
+                game.simulate_future(18.0, 0.0)
+                game.forecast_key()
+
+        threads = [threading.Thread(target=play) for _ in range(2)] + [threading.Thread(target=forecast) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        turns = [s.turn for s in game.head.chain()]
+        self.assertEqual(turns, list(range(1, 42)))
+        self.assertEqual([row["turn"] for row in game.history], list(range(1, 41)))
+
+    @unittest.skipUnless(importlib.util.find_spec("fastapi"), "fastapi not installed")
+    def test_api_branch_limit_and_delete(self):
+        import api
+        from fastapi import HTTPException
+        saved_limit, api.MAX_BRANCHES = api.MAX_BRANCHES, 3
+        try:
+            api.reset_game()
+            for i in range(3):
+                api.fork_branch(api.ForkInput(name=f"b{i}"))
+            with self.assertRaises(HTTPException) as caught:
+                api.fork_branch(api.ForkInput(name="one-too-many"))
+            self.assertEqual(caught.exception.status_code, 409)
+
+            api.delete_branch("b0")
+            with self.assertRaises(HTTPException) as caught:
+                api.delete_branch("b0")
+            self.assertEqual(caught.exception.status_code, 404)
+            api.fork_branch(api.ForkInput(name="b3"))
+            self.assertEqual(sorted(api.games), ["b1", "b2", "b3", "main"])
+        finally:
+            api.MAX_BRANCHES = saved_limit
+            api.games.clear()
+
+if __name__ == '__main__':
+    unittest.main()
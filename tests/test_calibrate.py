@@ -0,0 +1,118 @@
+import sys
+import os
+import json
+import tempfile
+import unittest
+
+# Setup path to import engine
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from engine import Economy, load_param_file
+from backends import HAS_NUMPY
+from calibrate import calibrate, simulate_scenario, evaluate, evaluate_batch, can_batch, validate_spec
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIO = {"gov_type": "Welfare", "months": 12, "policy": {"rate": 20.0, "money_printer": 2.0}}
+
+
+class TestCalibrationTool(unittest.TestCase):
+
+    def test_recovers_known_parameter(self):
+        """Targets generated with GRAVITY_INFLATION=0.05 should pull the default (0.02) back to 0.05."""
+        truth = dict(Economy.default_params(), GRAVITY_INFLATION=0.05)
+        path = simulate_scenario(SCENARIO, truth)["inflation"]
+        spec = {
+            "scenarios": {"welfare": SCENARIO},
+            "targets": [{"scenario": "welfare", "metric": "inflation", "path": path}],
+            "free": {"GRAVITY_INFLATION": [0.0, 0.1]},
+        }
+        result = calibrate(spec, workers=1, log=lambda msg: None)
+        self.assertAlmostEqual(result["params"]["GRAVITY_INFLATION"], 0.05, places=3)
+        self.assertLess(result["fit"]["final_loss"], result["fit"]["initial_loss"])
+
+    def test_fit_on_bound_is_flagged(self):
+        truth = dict(Economy.default_params(), GRAVITY_INFLATION=0.05)
+        spec = {
+            "scenarios": {"welfare": SCENARIO},
+            "targets": [{"scenario": "welfare", "metric": "inflation", "path": simulate_scenario(SCENARIO, truth)["inflation"]}],
+            "free": {"GRAVITY_INFLATION": [0.0, 0.03]},
+        }
+        result = calibrate(spec, workers=1, log=lambda msg: None)
+        self.assertAlmostEqual(result["params"]["GRAVITY_INFLATION"], 0.03)
+        self.assertEqual(result["fit"]["on_bound"], ["GRAVITY_INFLATION"])
+
+    def test_moment_target_and_param_file(self):
+        spec = {
+            "scenarios": {"contraction": {"gov_type": "Austerity", "months": 12, "policy": {"rate": 25.0, "money_printer": -10.0}}},
+            "targets": [{"scenario": "contraction", "metric": "inflation", "month": 12, "op": "<", "value": 5.0}],
+            "free": {"SENSITIVITY_INFLATION": [0.01, 0.1]},
+        }
+        result = calibrate(spec, workers=1, log=lambda msg: None)
+        self.assertEqual(evaluate(spec, result["params"])[0], 0.0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "params.json")
+            with open(out, "w", encoding="utf-8") as f:
+                json.dump(result, f)
+            game = Economy(fixed_gov_type="Austerity", params=load_param_file(out))
+        self.assertEqual(game.params, result["params"])
+
+    def test_invalid_targets_rejected(self):
+        base = {"scenarios": {"welfare": SCENARIO}, "free": {"GRAVITY_INFLATION": [0.0, 0.1]}}
+        bad_targets = [
+            {"scenario": "welfare", "metric": "inflation", "month": 0, "op": "<", "value": 5.0},
+            {"scenario": "welfare", "metric": "inflation", "month": 13, "op": "<", "value": 5.0},
+            {"scenario": "welfare", "metric": "inflation", "path": []},
+            {"scenario": "welfare", "metric": "inflation", "path": [15.0] * 13},
+            {"scenario": "nope", "metric": "inflation", "month": 1, "value": 5.0},
+            {"scenario": "welfare", "metric": "gdp", "month": 1, "value": 5.0},
+            {"scenario": "welfare", "metric": "inflation", "month": 1, "op": ">=", "value": 5.0},
+        ]
+        for target in bad_targets:
+            with self.subTest(target=target), self.assertRaises(ValueError):
+                validate_spec(dict(base, targets=[target]))
+
+    def test_invalid_free_parameters_rejected(self):
+        target = {"scenario": "welfare", "metric": "inflation", "month": 12, "op": "<", "value": 5.0}
+        base = {"scenarios": {"welfare": SCENARIO}, "targets": [target]}
+        for free in (None, {}, {"GRAVITY_NOPE": [0.0, 0.1]}, {"GRAVITY_INFLATION": 0.05}, {"GRAVITY_INFLATION": [0.1, 0.0]}):
+            spec = dict(base) if free is None else dict(base, free=free)
+            with self.subTest(free=free), self.assertRaises(ValueError):
+                calibrate(spec, workers=1, log=lambda msg: None)
+        with self.assertRaises(ValueError):
+            validate_spec(dict(base, free={"GRAVITY_INFLATION": [0.0, 0.1]}, prior_weight=-1.0))
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+    def test_batched_evaluation_matches_one_game_per_candidate(self):
+        with open(os.path.join(ROOT, "calibration", "targets.json"), encoding="utf-8") as f:
+            spec = json.load(f)
+        candidates = []
+        for u in (0.0, 0.3, 0.7, 1.0):
+            params = Economy.default_params()
+            for name, (low, high) in spec["free"].items():
+                params[name] = low + u * (high - low)
+            candidates.append(params)
+        self.assertTrue(can_batch(spec))
+        losses = evaluate_batch(spec, candidates)
+        for loss, params in zip(losses, candidates):
+            self.assertAlmostEqual(loss, evaluate(spec, params)[0], places=9)
+
+        tension = dict(spec, targets=[{"scenario": "populist_dove", "metric": "political_tension", "month": 6, "op": "<", "value": 50.0}])
+        self.assertFalse(can_batch(tension))
+        self.assertEqual(evaluate_batch(tension, candidates[:1]), [evaluate(tension, candidates[0])[0]])
+
+    def test_shipped_example_fit_is_not_degenerate(self):
+        """The example spec must not be satisfiable by pinning inflation to a model bound."""
+        with open(os.path.join(ROOT, "calibration", "targets.json"), encoding="utf-8") as f:
+            spec = json.load(f)
+        result = calibrate(spec, workers=1, log=lambda msg: None)
+        self.assertLess(result["fit"]["final_loss"], 1e-3)
+        self.assertEqual(result["fit"]["on_bound"], [])
+        for name, (low, high) in spec["free"].items():
+            self.assertTrue(low < result["params"][name] < high, name)
+        for name, scenario in spec["scenarios"].items():
+            inflation = simulate_scenario(scenario, result["params"])["inflation"]
+            self.assertTrue(all(Economy.MIN_INFLATION < x < Economy.MAX_INFLATION for x in inflation), name)
+            self.assertGreater(min(inflation), 0.0, name)
+
+if __name__ == '__main__':
+    unittest.main()
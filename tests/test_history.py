@@ -0,0 +1,131 @@
+import sys
+import os
+import random
+import tempfile
+import importlib.util
+import unittest
+
+# Setup path to import engine
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from engine import Economy
+from history import downsample, game_record, append_game, iter_chunks, aggregate
+
+
+class TestColumnarHistory(unittest.TestCase):
+
+    def test_columns_and_range(self):
+        game = Economy(fixed_gov_type="Welfare")
+        for _ in range(10):
+            game.next_turn(18.0, 0.0)
+        columns = game.history_columns(start=3, end=6)
+        self.assertEqual(columns["turn"], [3, 4, 5, 6])
+        self.assertEqual(columns["rate"], [18.0] * 4)
+        self.assertEqual(columns["inflation"][0], game.history[2]["inflation"])
+
+    def test_has_history(self):
+        game = Economy(fixed_gov_type="Welfare")
+        game.next_turn(15.0, 0.0, is_simulation=True)
+        self.assertFalse(game.has_history())
+        game.next_turn(15.0, 0.0)
+        game.next_turn(15.0, 0.0, is_simulation=True)
+        self.assertTrue(game.has_history())
+
+    def test_downsample_keeps_latest_turn(self):
+        columns = {"turn": list(range(1, 49)), "inflation": [float(i) for i in range(48)]}
+        sampled = downsample(columns, max_points=10)
+        self.assertLessEqual(len(sampled["turn"]), 10)
+        self.assertEqual(sampled["turn"][0], 1)
+        self.assertEqual(sampled["turn"][-1], 48)
+        self.assertEqual(downsample(columns, every=12)["turn"], [1, 13, 25, 37, 48])
+        self.assertIs(downsample(columns), columns)
+
+
+class TestHistoryAggregation(unittest.TestCase):
+
+    def test_streamed_aggregate(self):
+        random.seed(7) # real turns roll random events; keep the outcomes reproducible
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "games.jsonl")
+            for i in range(5):
+                game = Economy(fixed_gov_type="Austerity")
+                while not game.game_over_status["is_game_over"]:
+                    game.next_turn(40.0, 0.0)
+                append_game(path, game_record(game, f"g{i}"))
+            game = Economy(fixed_gov_type="Welfare", initial_inflation=10.0)
+            game.next_turn(15.0, 0.0)
+            append_game(path, game_record(game, "quit", outcome="abandoned"))
+
+            self.assertEqual([len(chunk) for chunk in iter_chunks(path, chunk_size=2)], [2, 2, 2])
+            stats = aggregate(path, chunk_size=2)
+
+        self.assertEqual(stats["games"], 6)
+        self.assertEqual(stats["outcomes_by_gov"]["Austerity"]["lose_pol: Fired"]["count"], 5)
+        self.assertEqual(stats["outcomes_by_gov"]["Welfare"], {"abandoned": {"count": 1, "share": 1.0}})
+        first_month = stats["avg_inflation_by_month"][0]
+        self.assertEqual(first_month["games"], 6)
+        self.assertAlmostEqual(first_month["inflation"], (15.0 * 5 + 10.0) / 6, places=3)
+
+    def test_turn_count_matches_logged_columns(self):
+        game = Economy(fixed_gov_type="Welfare")
+        for _ in range(6):
+            game.next_turn(15.0, 0.0)
+        game.next_turn(15.0, 0.0, is_simulation=True) # what /state does
+        record = game_record(game, "g", outcome="abandoned")
+        self.assertEqual(record["turns"], 6)
+        self.assertEqual(len(record["columns"]["turn"]), 6)
+
+    def test_months_follow_logged_rows_not_turn_numbers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "games.jsonl")
+            game = Economy(fixed_gov_type="Welfare")
+            for _ in range(3):
+                game.next_turn(15.0, 0.0, is_simulation=True) # /state polls between real turns
+                game.next_turn(15.0, 0.0)
+            record = game_record(game, "gappy", outcome="abandoned")
+            self.assertEqual(record["columns"]["turn"], [2, 4, 6])
+            append_game(path, record)
+            stats = aggregate(path)
+        self.assertEqual([row["month"] for row in stats["avg_inflation_by_month"]], [1, 2, 3])
+        self.assertEqual(stats["avg_inflation_by_month"][2]["inflation"], round(record["columns"]["inflation"][2], 3))
+
+    def test_duplicate_game_ids_counted_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "games.jsonl")
+            game = Economy(fixed_gov_type="Liberal")
+            game.next_turn(15.0, 0.0)
+            for _ in range(3):
+                append_game(path, game_record(game, "same", outcome="abandoned"))
+            stats = aggregate(path, chunk_size=2)
+        self.assertEqual(stats["games"], 1)
+        self.assertEqual(stats["avg_inflation_by_month"][0]["games"], 1)
+
+    @unittest.skipUnless(importlib.util.find_spec("fastapi"), "fastapi not installed")
+    def test_forked_finished_game_persisted_once(self):
+        import api
+        random.seed(3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "games.jsonl")
+            saved_file, api.HISTORY_FILE = api.HISTORY_FILE, path
+            try:
+                api.reset_game()
+                while not api.get_game("main").game_over_status["is_game_over"]:
+                    api.next_turn(api.PolicyInput(interest_rate=40.0))
+                # Forks of the finished game, and a rewind of main, played to game over again
+                for name in ("alt1", "alt2"):
+                    api.fork_branch(api.ForkInput(turn=3, name=name))
+                    while not api.get_game(name).game_over_status["is_game_over"]:
+                        api.next_turn(api.PolicyInput(interest_rate=40.0, branch=name))
+                api.rewind_branch("main", 3)
+                while not api.get_game("main").game_over_status["is_game_over"]:
+                    api.next_turn(api.PolicyInput(interest_rate=40.0))
+                api.reset_game() # already persisted: must not be written again as "abandoned"
+                stats = aggregate(path)
+            finally:
+                api.HISTORY_FILE = saved_file
+                api.games.clear()
+        self.assertEqual(stats["games"], 1)
+        self.assertEqual(sum(row["count"] for causes in stats["outcomes_by_gov"].values() for row in causes.values()), 1)
+        self.assertEqual(stats["avg_inflation_by_month"][0]["games"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
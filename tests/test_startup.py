@@ -0,0 +1,58 @@
+import sys
+import os
+import subprocess
+import time
+import threading
+import importlib.util
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Optional subsystems that must stay out of the cold-start path until first use
+HEAVY_MODULES = ("numpy", "calibrate")
+
+
+def loaded_after_import(module):
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return [m for m in out.stdout.strip().split(",") if m]
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_engine_cold_import(self):
+        self.assertEqual(loaded_after_import("engine"), [])
+
+    @unittest.skipUnless(importlib.util.find_spec("fastapi"), "fastapi not installed")
+    def test_api_cold_import(self):
+        self.assertEqual(loaded_after_import("api"), [])
+
+    @unittest.skipUnless(importlib.util.find_spec("fastapi"), "fastapi not installed")
+    def test_concurrent_first_requests_share_one_game(self):
+        sys.path.insert(0, ROOT)
+        import api
+        built, original = [], api.new_game
+
+        def slow_new_game():
+            game = original()
+            time.sleep(0.02) # widen the race window
+            built.append(game)
+            return game
+
+        api.games.clear()
+        api.new_game = slow_new_game
+        try:
+            seen = []
+            threads = [threading.Thread(target=lambda: seen.append(api.get_game("main"))) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            api.new_game = original
+            api.games.clear()
+        self.assertEqual(len(built), 1)
+        self.assertTrue(all(game is built[0] for game in seen))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import sys
+import os
+import time
+import threading
+import unittest
+
+# Setup path to import engine
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from engine import Economy
+from throttle import TokenBucketLimiter, SingleFlight
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_refill(self):
+        clock = FakeClock()
+        limiter = TokenBucketLimiter(rate=2.0, burst=3, clock=clock)
+        self.assertEqual([limiter.allow("a")[0] for _ in range(4)], [True, True, True, False])
+
+        allowed, retry_after = limiter.allow("a")
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(retry_after, 0.5)
+
+        clock.now += 0.5 # one token back
+        self.assertTrue(limiter.allow("a")[0])
+        self.assertFalse(limiter.allow("a")[0])
+
+    def test_invalid_limits_rejected(self):
+        with self.assertRaises(ValueError):
+            TokenBucketLimiter(rate=0, burst=1)
+        with self.assertRaises(ValueError):
+            TokenBucketLimiter(rate=1, burst=0)
+
+    def test_clients_are_isolated(self):
+        limiter = TokenBucketLimiter(rate=1.0, burst=1, clock=FakeClock())
+        self.assertTrue(limiter.allow("a")[0])
+        self.assertFalse(limiter.allow("a")[0])
+        self.assertTrue(limiter.allow("b")[0])
+
+    def test_bucket_table_is_bounded(self):
+        clock = FakeClock()
+        limiter = TokenBucketLimiter(rate=1.0, burst=2, clock=clock, max_keys=1000)
+        limiter.allow("keep")
+        for i in range(3000):
+            clock.now += 0.001
+            limiter.allow(i)
+            if i % 100 == 0:
+                limiter.allow("keep") # recently seen keys survive
+        self.assertEqual(len(limiter._buckets), 1000)
+        self.assertIn("keep", limiter._buckets)
+        self.assertNotIn(0, limiter._buckets)
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_calls_share_one_computation(self):
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return ["forecast"]
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flight.do("k", compute))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        while flight.in_flight() == 0:
+            time.sleep(0.001)
+        time.sleep(0.05) # let the followers queue up behind the leader
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_errors_propagate_and_are_not_cached(self):
+        flight = SingleFlight()
+        with self.assertRaises(ZeroDivisionError):
+            flight.do("k", lambda: 1 / 0)
+        self.assertEqual(flight.do("k", lambda: 42), 42)
+
+    def test_forecast_key_matches_identical_states(self):
+        a, b = Economy(fixed_gov_type="Welfare"), Economy(fixed_gov_type="Welfare")
+        self.assertEqual(a.forecast_key(), b.forecast_key())
+        self.assertEqual(a.simulate_future(20.0, 0.0), b.simulate_future(20.0, 0.0))
+        b.set_params({"GRAVITY_GDP": 0.1})
+        self.assertNotEqual(a.forecast_key(), b.forecast_key())
+        a.next_turn(20.0, 0.0, is_simulation=True)
+        self.assertNotEqual(a.forecast_key(), Economy(fixed_gov_type="Welfare").forecast_key())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets: `rate` tokens/second refill, up to `burst` stored.
+
+    allow() is O(1) under a single lock, so a rejected request costs almost nothing.
+    At most `max_keys` buckets are kept; the least recently seen key is evicted first.
+    """
+
+    def __init__(self, rate: float, burst: float, clock=time.monotonic, max_keys: int = 10000):
+        if rate <= 0:
+            raise ValueError(f"rate must be > 0 tokens/second, got {rate}")
+        if burst < 1:
+            raise ValueError(f"burst must be >= 1, got {burst}")
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> [tokens, last_refill], oldest access first
+        self._lock = threading.Lock()
+
+    def allow(self, key):
+        """Take one token for `key`. Returns (allowed, retry_after_seconds)."""
+        now = self.clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._buckets.popitem(last=False)
+                bucket = self._buckets[key] = [self.burst, now]
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1.0:
+                bucket[0] -= 1.0
+                return True, 0.0
+            return False, (1.0 - bucket[0]) / self.rate
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key: the first caller computes,
+    everyone who arrives while it is running waits and gets the same result.
+    Nothing is cached once the call finishes."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)